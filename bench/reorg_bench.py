@@ -0,0 +1,63 @@
+"""
+Reorganization benchmark on a generated org of 50k employees.
+
+Run from the repo root:  python bench/reorg_bench.py [employees]
+Everything is created in a temporary directory; data/ is not touched.
+Also checks that a team created the way the menu does (Team.load().save())
+follows its department through rename and merge.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.employee import Employee
+from models.team import Team
+from services.storage import (save_department_txt, save_team_txt_for, save_director_txt,
+    load_department_txt, load_director_txt, list_department_names)
+from services.reorg import transfer_employees, merge_departments, split_department, rename_department
+
+def seed(employees: int) -> None:
+    half = employees // 2
+    save_department_txt("Engineering", [Employee(f"E{i}", "dev" if i % 2 else "qa", 1000) for i in range(half)])
+    save_department_txt("Sales", [Employee(f"S{i}", "sales", 1000) for i in range(employees - half)])
+    for t in range(20):
+        save_team_txt_for("Engineering", f"Team {t}", [f"E{i}" for i in range(t, half, 20)])
+        save_team_txt_for("Sales", f"Team {t}", [f"S{i}" for i in range(t, employees - half, 20)])
+    for d in range(10):
+        save_director_txt(f"Director {d}", "Director", 9000, ["Engineering", "Sales"], [])
+    team = Team.load("Menu Team", "Engineering")  # same calls as create_team_flow
+    team.add_member("E0")
+    team.save()
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {time.perf_counter() - start:8.2f}s  {result} file(s)")
+    return result
+
+def main():
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    half = employees // 2
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # DATA_ROOT is a relative path
+        seed(employees)
+        moving = [f"E{i}" for i in range(1, half, 2)]
+        timed(f"transfer {len(moving)} employees", lambda: transfer_employees(moving, "Engineering", "Sales"))
+        timed("split Sales by position 'dev'", lambda: split_department("Sales", "Platform", positions=["dev"]))
+        timed("merge Platform into Engineering", lambda: merge_departments("Platform", "Engineering"))
+        timed("rename Engineering -> R&D", lambda: rename_department("Engineering", "R&D"))
+        timed("merge R&D into Sales", lambda: merge_departments("R&D", "Sales"))
+
+        assert list_department_names() == ["Sales"]
+        assert len(load_department_txt("Sales")) == employees
+        assert load_director_txt("Director 0")[3] == ["Sales"]
+        assert Team.load("Menu Team", "Sales").members == ["E0"]
+        assert not list(Path("data/teams").glob("Engineering*")) and not list(Path("data/teams").glob("R_D*"))
+        print("checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Snapshot benchmark on a generated org of 100k files.
+
+Run from the repo root:  python bench/snapshot_bench.py [files]
+Everything is created in a temporary directory; data/ is not touched.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.employee import Employee
+from services.storage import save_department_txt, save_manager_txt, load_department_txt
+from services.snapshot import create_snapshot, restore_snapshot
+
+def seed(files: int) -> None:
+    managers = files // 10
+    for i in range(files - managers):
+        save_department_txt(f"Dept {i}", [Employee(f"E{i}_{j}", "dev", 1000 + j) for j in range(5)])
+    for i in range(managers):
+        save_manager_txt(f"Manager {i}", "Manager", 3000, [f"E{i}_0", f"E{i}_1"])
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {time.perf_counter() - start:8.2f}s  {result}")
+    return result
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # DATA_ROOT and SNAPSHOT_ROOT are relative paths
+        timed(f"seed {files} files", lambda: seed(files))
+        first = timed("first snapshot", create_snapshot)
+        timed("no-change snapshot", create_snapshot)
+        save_department_txt("Dept 0", [Employee("Changed", "dev", 1)])
+        timed("1-file-change snapshot", create_snapshot)
+        timed("restore one entity", lambda: restore_snapshot(first[0], "departments/Dept 0"))
+        assert load_department_txt("Dept 0")[0][0] == "E0_0"
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,18 @@
-from pathlib import Path
 from typing import Optional
 from services.logger import get_logger
 from services.storage import (ensure_dirs, 
-list_manager_names, list_director_names)
+list_manager_names, list_director_names, list_department_names)
+from services.archive import ARCHIVE_AFTER_DAYS, archive_inactive, archive_report
+from services.integrity import check_integrity, repair_orphans
+from services.snapshot import SnapshotError, create_snapshot, list_snapshots, restore_snapshot
+from services.reorg import (ReorgError, transfer_employees, merge_departments,
+    split_department, rename_department, recover_reorg)
 from models.employee import Employee
 from models.department import Department
 from models.manager import Manager
 from models.director import Director
 from models.team import Team
 
-DEPT_DIR = Path("data/departments")
-
-
-def list_department_names() -> list[str]:
-    """Return department names inferred from TXT files in data/departments."""
-    if not DEPT_DIR.exists():
-        return []
-    names = []
-    for p in DEPT_DIR.glob("*.txt"):
-        # file 'IT.txt' -> name 'IT'
-        names.append(p.stem.replace("_", " "))
-    return sorted(names, key=str.casefold)
-
 def select_or_create_department() -> Department:
     """Interactive selector that loads or creates a department by name."""
     existing = list_department_names()
@@ -251,7 +242,7 @@ def create_team_flow(dept: Department, logger):
     if not team_name:
         print("Team name cannot be empty.")
         return
-    team = Team.load(dept.name, team_name)  # if not exists, load() returns empty team
+    team = Team.load(team_name, dept.name)  # if not exists, load() returns empty team
     # if already has file/members, it's effectively existing; still fine to "recreate"
     team.save()
     if logger:
@@ -267,9 +258,131 @@ def list_teams_flow(dept: Department):
     for t in teams:
         print(f"- {t}")
 
+def archive_flow(logger):
+    print("\n=== Archive inactive data ===")
+    s = input(f"Archive entities untouched for how many days? [{ARCHIVE_AFTER_DAYS}]: ").strip()
+    try:
+        days = float(s) if s else ARCHIVE_AFTER_DAYS
+        if days < 0:
+            print("Days cannot be negative.")
+            return
+    except ValueError:
+        print("Invalid number.")
+        return
+    archived = archive_inactive(days, logger=logger)
+    print(f"Archived {len(archived)} file(s).")
+    for a in archived:
+        print(f"- {a}")
+
+    report = archive_report()
+    print(f"Cold tier: {report['archived']} file(s), "
+          f"{report['raw_bytes']} -> {report['stored_bytes']} bytes "
+          f"(saved {report['bytes_saved']}).")
+    for kind in report["cold_load_ms"]:
+        cold = report["cold_load_ms"][kind]
+        hot = report["hot_load_ms"][kind]
+        cold_s = f"{cold:.3f} ms" if cold is not None else "-"
+        hot_s = f"{hot:.3f} ms" if hot is not None else "-"
+        print(f"  {kind}: avg load cold {cold_s} | hot {hot_s}")
+
+def integrity_flow(logger):
+    print("\n=== Check data integrity ===")
+    full = input("Full rescan? [y/N]: ").strip().lower() == "y"
+    issues = check_integrity(full=full, logger=logger)
+    if not issues:
+        print("No integrity issues found.")
+        return
+    print(f"Found {len(issues)} issue(s):")
+    for i in issues:
+        check, source, detail = i.split("|", 2)
+        print(f"- [{check}] {source}: {detail}")
+    if any(i.startswith("orphan|") for i in issues):
+        if input("Remove dangling references? [y/N]: ").strip().lower() == "y":
+            fixed = repair_orphans(logger=logger)
+            print(f"Repaired {fixed} file(s).")
+
+def snapshot_flow(logger):
+    snapshot_id, files, written = create_snapshot(logger=logger)
+    print(f"Snapshot {snapshot_id} saved: {files} file(s), {written} new object(s).")
+
+def restore_flow(logger):
+    snapshots = list_snapshots()
+    if not snapshots:
+        print("No snapshots saved yet.")
+        return
+    print("\nSnapshots:")
+    for i, s in enumerate(snapshots, start=1):
+        print(f"{i}) {s}")
+    choice = input("Select number: ").strip()
+    if not choice.isdigit() or not (1 <= int(choice) <= len(snapshots)):
+        print("Invalid selection.")
+        return
+    snapshot_id = snapshots[int(choice) - 1]
+    print("Entity to restore: departments/<Name>, managers/<Name>, directors/<Name>")
+    print("or teams/<Department>/<Team>.")
+    entity = input("Entity (empty = whole tree): ").strip() or None
+    try:
+        changed = restore_snapshot(snapshot_id, entity=entity, logger=logger)
+    except SnapshotError as e:
+        print(f"Restore not applied: {e}")
+        return
+    print(f"Restored {entity or 'data tree'} from {snapshot_id}: {changed} file(s) changed.")
+
+def load_department_by_name(name: str) -> Department:
+    """Load a department by name, matching the stored name case-insensitively."""
+    key = name.strip().casefold()
+    for existing in list_department_names():
+        if existing.casefold() == key:
+            return Department.load(existing)
+    return Department.load(name.strip())
+
+def reorg_flow(dept: Department, logger) -> Department:
+    """Reorganize starting from the current department; returns the department to continue with."""
+    print(f"\n=== Reorganize (current: {dept.name}) ===")
+    print("1) Transfer employees to another department")
+    print("2) Merge current department into another")
+    print("3) Split current department")
+    print("4) Rename current department")
+    op = input("Select: ").strip()
+    try:
+        if op == "1":
+            names = [n.strip() for n in input("Employee names (comma separated): ").split(",") if n.strip()]
+            target = input("Target department: ").strip()
+            transfer_employees(names, dept.name, target, logger=logger)
+            print(f"Transferred {len(names)} employee(s) to {target}.")
+        elif op == "2":
+            target = input("Merge into department: ").strip()
+            merge_departments(dept.name, target, logger=logger)
+            print(f"Department {dept.name} merged into {target}.")
+            return load_department_by_name(target)
+        elif op == "3":
+            new_name = input("New department name: ").strip()
+            by = input("Split by (P)osition or (N)ames? [P/N]: ").strip().lower()
+            values = [v.strip() for v in input("Values (comma separated): ").split(",") if v.strip()]
+            if by == "n":
+                split_department(dept.name, new_name, names=values, logger=logger)
+            else:
+                split_department(dept.name, new_name, positions=values, logger=logger)
+            print(f"Department {new_name} split off from {dept.name}.")
+        elif op == "4":
+            new_name = input("New name: ").strip()
+            rename_department(dept.name, new_name, logger=logger)
+            print(f"Department {dept.name} renamed to {new_name}.")
+            return load_department_by_name(new_name)
+        else:
+            print("Invalid choice.")
+            return dept
+    except ReorgError as e:
+        print(f"Reorganization not applied: {e}")
+        return dept
+    return Department.load(dept.name)
+
 def main():
     ensure_dirs()
     logger = get_logger()
+    recovered = recover_reorg(logger=logger)
+    if recovered:
+        print(f"An interrupted reorganization was {recovered}.")
     dept = select_or_create_department()
     current_manager = None
     current_director = None 
@@ -291,6 +404,11 @@ def main():
         print("11) Director: make decision")
         print("12) Load director")         
         print("13) Save current director") 
+        print("14) Archive inactive data")
+        print("15) Check data integrity")
+        print("16) Snapshot data")
+        print("17) Restore snapshot")
+        print("18) Reorganize departments")
         print("0) Exit")
         choice = input("Select: ").strip()
 
@@ -342,6 +460,21 @@ def main():
         elif choice == "13":
             save_current_director_flow(current_director)
             
+        elif choice == "14":
+            archive_flow(logger)
+            
+        elif choice == "15":
+            integrity_flow(logger)
+            
+        elif choice == "16":
+            snapshot_flow(logger)
+            
+        elif choice == "17":
+            restore_flow(logger)
+            
+        elif choice == "18":
+            dept = reorg_flow(dept, logger)
+            
         elif choice == "0":
             print("Bye.")
             break
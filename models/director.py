@@ -26,7 +26,7 @@ class Director(Manager):
         )
 
     @classmethod
-    def load(cls, name: str) -> Director | None:
+    def load(cls, name: str) -> "Director | None":
         row = load_director_txt(name)
         if row is None:
             return None
@@ -1,12 +1,15 @@
 
 from typing import List, Optional
 
-from services.storage import load_team_txt, save_team_txt, list_team_names_for_department
+from services.storage import (load_team_txt, delete_team_txt, find_team_file,
+    save_team_txt_for, team_file_for, list_team_names_for_department)
 
 class Team:
     """
     Team belongs to a department (by name) and stores members as names.
-    Persisted to data/teams/<team_name>.txt (one name per line).
+    Persisted to data/teams/<Dept>__<Team>.txt (one name per line).
+    Legacy '<Dept>_<Team>.txt' and '<Team>_<Dept>.txt' files are still
+    read and replaced on save.
     """
     def __init__(self, name: str, department_name: str, members: Optional[List[str]] = None):
         self.name = name
@@ -15,11 +18,15 @@ class Team:
 
     @classmethod
     def load(cls, team_name: str, department_name: str) -> "Team":
-        members = load_team_txt(cls._full_team_key(team_name, department_name))
+        path = find_team_file(department_name, team_name)
+        members = load_team_txt(path.stem) if path else []
         return cls(name=team_name, department_name=department_name, members=members)
 
     def save(self) -> None:
-        save_team_txt(self._full_team_key(self.name, self.department_name), self.members)
+        legacy = find_team_file(self.department_name, self.name)
+        save_team_txt_for(self.department_name, self.name, self.members)
+        if legacy and legacy != team_file_for(self.department_name, self.name):
+            delete_team_txt(legacy.stem)
 
     def add_member(self, member_name: str) -> bool:
         """Add if not already present (case-insensitive check). Returns True if added."""
@@ -32,10 +39,6 @@ class Team:
     def list_members(self) -> list[str]:
         return list(self.members)
 
-    @staticmethod
-    def _full_team_key(team_name: str, department_name: str) -> str:
-        return f"{department_name}_{team_name}"
-
     @staticmethod
     def list_for_department(department_name: str) -> list[str]:
         return list_team_names_for_department(department_name)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import gzip
+import shutil
+import time
+from itertools import islice
+from pathlib import Path
+
+from services.storage import (DATA_ROOT, ARCHIVE_ROOT, archive_file,
+    load_department_txt, load_manager_txt, load_director_txt)
+
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVED_KINDS = ("departments", "managers", "directors")
+INDEX_FILE = ARCHIVE_ROOT / "index.txt"
+LATENCY_SAMPLE = 20
+
+LOADERS = {
+    "departments": load_department_txt,
+    "managers": load_manager_txt,
+    "directors": load_director_txt,
+}
+
+def load_index() -> dict[tuple[str, str], tuple[float, int, int]]:
+    """
+    Returns {(kind, file_name): (archived_at, raw_bytes, stored_bytes)}.
+    Entries whose archive was promoted back to the hot tier are skipped.
+    """
+    index = {}
+    if not INDEX_FILE.exists():
+        return index
+    with INDEX_FILE.open("r", encoding="utf-8") as f:
+        header = f.readline()  # discard header
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            kind, file_name, archived_at, raw, stored = line.split("|")
+            if (ARCHIVE_ROOT / kind / file_name).exists():
+                index[(kind, file_name)] = (float(archived_at), int(raw), int(stored))
+    return index
+
+def save_index(index: dict[tuple[str, str], tuple[float, int, int]]) -> None:
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_FILE.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write("kind|file|archived_at|raw_bytes|stored_bytes\n")
+        for (kind, file_name), (archived_at, raw, stored) in sorted(index.items()):
+            f.write(f"{kind}|{file_name}|{archived_at}|{raw}|{stored}\n")
+    tmp.replace(INDEX_FILE)
+
+def archive_file_to_cold(path: Path) -> tuple[int, int] | None:
+    """
+    Compress one hot file into the cold tier and remove the hot copy.
+    Returns (raw_bytes, stored_bytes), or None when compression would not
+    save space (small files) and the file stays hot.
+    """
+    cold = archive_file(path)
+    cold.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cold.with_suffix(".tmp")
+    with path.open("rb") as src, gzip.open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    raw, stored = path.stat().st_size, tmp.stat().st_size
+    if stored >= raw:
+        tmp.unlink()
+        return None
+    tmp.replace(cold)
+    path.unlink()
+    return raw, stored
+
+def archive_inactive(days: float = ARCHIVE_AFTER_DAYS, logger=None) -> list[str]:
+    """
+    Move departments, managers and directors whose files were not modified
+    for `days` days into the cold tier. Returns archived entries as 'kind/Name'.
+    """
+    cutoff = time.time() - days * 86400
+    index = load_index()
+    archived = []
+    for kind in ARCHIVED_KINDS:
+        hot_dir = DATA_ROOT / kind
+        if not hot_dir.exists():
+            continue
+        for path in sorted(hot_dir.glob("*.txt")):
+            if path.stat().st_mtime > cutoff:
+                continue
+            sizes = archive_file_to_cold(path)
+            if sizes is None:
+                continue
+            raw, stored = sizes
+            index[(kind, archive_file(path).name)] = (time.time(), raw, stored)
+            archived.append(f"{kind}/{path.stem}")
+            if logger:
+                logger.info(f"[Archive] {kind}/{path.stem}: {raw} -> {stored} bytes")
+    save_index(index)
+    return archived
+
+def _avg_load_ms(kind: str, names: list[str]) -> float | None:
+    if not names:
+        return None
+    loader = LOADERS[kind]
+    start = time.perf_counter()
+    for n in names:
+        loader(n)
+    return (time.perf_counter() - start) * 1000 / len(names)
+
+def archive_report() -> dict:
+    """
+    Bytes saved by the cold tier and the average load latency of
+    cold vs hot entities (milliseconds per load), timed on up to
+    LATENCY_SAMPLE entities per kind and tier.
+    """
+    index = load_index()
+    raw = sum(r for (_, r, _) in index.values())
+    stored = sum(s for (_, _, s) in index.values())
+    cold_names = {kind: [] for kind in ARCHIVED_KINDS}
+    for (kind, file_name) in index:
+        if len(cold_names[kind]) < LATENCY_SAMPLE:
+            cold_names[kind].append(file_name[:-len(".txt.gz")].replace("_", " "))
+    hot_names = {
+        kind: [p.stem.replace("_", " ") for p in islice((DATA_ROOT / kind).glob("*.txt"), LATENCY_SAMPLE)]
+        for kind in ARCHIVED_KINDS
+    }
+    return {
+        "archived": len(index),
+        "raw_bytes": raw,
+        "stored_bytes": stored,
+        "bytes_saved": raw - stored,
+        "cold_load_ms": {k: _avg_load_ms(k, v) for k, v in cold_names.items()},
+        "hot_load_ms": {k: _avg_load_ms(k, v) for k, v in hot_names.items()},
+    }
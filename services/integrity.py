@@ -0,0 +1,287 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from services.storage import (DATA_ROOT, ARCHIVE_ROOT, safe_name, file_hash,
+    load_department_txt, load_manager_txt, save_manager_txt,
+    load_director_txt, save_director_txt, load_team_txt, save_team_txt)
+
+# kept outside data/ so snapshots and archives never pick up the cache
+STATE_FILE = Path("cache") / "integrity_state.json"
+CHECKED_KINDS = ("departments", "managers", "directors", "teams")
+MAX_WORKERS = 8
+
+# --- Scanning ---
+
+def _entity_files() -> dict[str, Path]:
+    """
+    Returns {'<kind>/<Stem>': path} for every entity file in the hot and cold tier.
+    A hot file shadows its archived copy, the same way the loaders resolve them.
+    """
+    files = {}
+    for kind in CHECKED_KINDS:
+        cold_dir = ARCHIVE_ROOT / kind
+        if cold_dir.exists():
+            for p in cold_dir.glob("*.txt.gz"):
+                files[f"{kind}/{p.name[:-len('.txt.gz')]}"] = p
+        hot_dir = DATA_ROOT / kind
+        if hot_dir.exists():
+            for p in hot_dir.glob("*.txt"):
+                files[f"{kind}/{p.stem}"] = p
+    return files
+
+EMPTY_DATA = {
+    "departments": {"employees": []},
+    "managers": {"reports": []},
+    "directors": {"departments": [], "reports": []},
+    "teams": {"members": []},
+}
+
+def _parse(key: str) -> dict:
+    """
+    Load one entity through the storage loaders and keep only the names we check.
+    A file the loaders cannot parse comes back empty with a 'malformed' reason,
+    so one bad file is reported instead of aborting the whole scan.
+    """
+    kind, stem = key.split("/", 1)
+    try:
+        return _parse_entity(kind, stem)
+    except (ValueError, IndexError, OSError) as e:
+        data = {**EMPTY_DATA[kind], "malformed": f"{type(e).__name__}: {e}"}
+        if kind in ("managers", "directors"):
+            data["name"] = stem.replace("_", " ")
+        return data
+
+def _parse_entity(kind: str, stem: str) -> dict:
+    name = stem.replace("_", " ")
+    if kind == "departments":
+        return {"employees": [n for (n, _, _) in load_department_txt(name)]}
+    if kind == "managers":
+        row = load_manager_txt(name)
+        return {"name": row[0] if row else name, "reports": row[3] if row else []}
+    if kind == "directors":
+        row = load_director_txt(name)
+        if row is None:
+            return {"name": name, "departments": [], "reports": []}
+        return {"name": row[0], "departments": row[3], "reports": row[4]}
+    return {"members": load_team_txt(stem)}
+
+def _scan_one(key: str, path: Path, cached: dict | None) -> tuple[dict, bool]:
+    """
+    Returns (state entry, changed). Unchanged mtime and size reuse the cache;
+    otherwise the file is hashed and only re-parsed if the content differs.
+    """
+    st = path.stat()
+    if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+        return cached, False
+    digest = file_hash(path)
+    entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+    if cached and cached["sha256"] == digest:
+        entry["data"] = cached["data"]
+        return entry, False
+    entry["data"] = _parse(key)
+    return entry, True
+
+def load_state() -> dict:
+    if not STATE_FILE.exists():
+        return {"files": {}, "issues": {}}
+    with STATE_FILE.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_state(state: dict) -> None:
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_FILE.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f)
+    tmp.replace(STATE_FILE)
+
+# --- Checks ---
+
+def _team_department(stem: str, dept_keys: dict[str, str]) -> str | None:
+    """
+    Team files are '<Dept>__<Team>', or legacy '<Dept>_<Team>' / '<Team>_<Dept>';
+    pick the longest department stem that prefixes the team file, else the
+    longest one that ends a legacy file name.
+    """
+    key = stem.casefold()
+    best = None
+    for safe, dept_stem in dept_keys.items():
+        if key.startswith(safe + "_") and (best is None or len(safe) > len(best[0])):
+            best = (safe, dept_stem)
+    if best is None and "__" not in key:
+        for safe, dept_stem in dept_keys.items():
+            if key.endswith("_" + safe) and (best is None or len(safe) > len(best[0])):
+                best = (safe, dept_stem)
+    return best[1] if best else None
+
+def _build_indexes(files: dict[str, dict]) -> dict:
+    employees: dict[str, list[str]] = {}   # casefold name -> [department stem]
+    departments: set[str] = set()
+    managers: set[str] = set()
+    for key, entry in files.items():
+        kind, stem = key.split("/", 1)
+        data = entry["data"]
+        if kind == "departments":
+            departments.add(stem.replace("_", " ").casefold())
+            for n in data["employees"]:
+                employees.setdefault(n.casefold(), []).append(stem)
+        elif kind in ("managers", "directors"):
+            managers.add(data["name"].casefold())
+    dept_keys = {safe_name(k.split("/", 1)[1]).casefold(): k.split("/", 1)[1]
+                 for k in files if k.startswith("departments/")}
+    return {"employees": employees, "departments": departments,
+            "managers": managers, "dept_keys": dept_keys}
+
+def _check_entity(key: str, data: dict, idx: dict) -> list[str]:
+    """Orphan and duplicate checks for a single entity file."""
+    kind, stem = key.split("/", 1)
+    issues = []
+    if "malformed" in data:
+        issues.append(f"malformed|{key}|{data['malformed']}")
+    employees = idx["employees"]
+    if kind == "departments":
+        for n in data["employees"]:
+            depts = sorted(set(employees.get(n.casefold(), [])), key=str.casefold)
+            # one issue per employee, on the alphabetically first department
+            if len(depts) > 1 and depts[0] == stem:
+                issues.append(f"duplicate|{key}|'{n}' listed in {', '.join(depts)}")
+    elif kind in ("managers", "directors"):
+        for d in data.get("departments", []):
+            if d.casefold() not in idx["departments"]:
+                issues.append(f"orphan|{key}|department '{d}' does not exist")
+        for r in data["reports"]:
+            if r.casefold() not in employees and r.casefold() not in idx["managers"]:
+                issues.append(f"orphan|{key}|direct report '{r}' not found")
+    elif kind == "teams":
+        dept = _team_department(stem, idx["dept_keys"])
+        if dept is None:
+            issues.append(f"orphan|{key}|team does not belong to an existing department")
+        for m in data["members"]:
+            depts = employees.get(m.casefold(), [])
+            if not depts or (dept is not None and dept not in depts):
+                where = f"department {dept}" if dept else "any department"
+                issues.append(f"orphan|{key}|member '{m}' not found in {where}")
+    return issues
+
+def _find_cycles(files: dict[str, dict]) -> list[str]:
+    """Cycles in the manager/director -> direct report graph."""
+    graph: dict[str, list[str]] = {}
+    display: dict[str, str] = {}
+    for key, entry in files.items():
+        if key.startswith(("managers/", "directors/")):
+            name = entry["data"]["name"]
+            display[name.casefold()] = name
+            graph.setdefault(name.casefold(), []).extend(r.casefold() for r in entry["data"]["reports"])
+    cycles = []
+    state: dict[str, int] = {}   # 1 = on stack, 2 = done
+    for root in graph:
+        if root in state:
+            continue
+        stack = [(root, iter(graph[root]))]
+        path = [root]
+        state[root] = 1
+        while stack:
+            node, children = stack[-1]
+            nxt = next(children, None)
+            if nxt is None:
+                state[node] = 2
+                stack.pop()
+                path.pop()
+            elif nxt in graph and state.get(nxt) == 1:
+                loop = path[path.index(nxt):] + [nxt]
+                cycles.append("cycle|reporting|" + " -> ".join(display[n] for n in loop))
+            elif nxt in graph and nxt not in state:
+                state[nxt] = 1
+                stack.append((nxt, iter(graph[nxt])))
+                path.append(nxt)
+    return cycles
+
+def check_integrity(full: bool = False, logger=None) -> list[str]:
+    """
+    Scan the data tree and return issues as 'check|source|detail' strings.
+    Only files whose mtime/size and hash changed since the last run are
+    re-read; cached results are reused for the rest unless the name
+    indexes they depend on changed. `full=True` ignores the stored state.
+    """
+    state = {"files": {}, "issues": {}} if full else load_state()
+    paths = _entity_files()
+    cached = state["files"]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = pool.map(lambda k: _scan_one(k, paths[k], cached.get(k)), paths)
+        scanned = dict(zip(paths, results))
+
+    files = {k: entry for k, (entry, _) in scanned.items()}
+    changed = {k for k, (_, ch) in scanned.items() if ch}
+    removed = set(cached) - set(files)
+    # A change to a department, manager or director can turn any reference anywhere
+    # into an orphan (or fix one), so those invalidate every entity.
+    index_changed = any(not k.startswith("teams/") for k in changed | removed)
+
+    idx = _build_indexes(files)
+    issues = {} if index_changed or full else {
+        k: v for k, v in state["issues"].items() if k in files and k not in changed
+    }
+    for key in files:
+        if key not in issues:
+            issues[key] = _check_entity(key, files[key]["data"], idx)
+
+    cycles = _find_cycles(files) if index_changed or full else state["issues"].get("cycles", [])
+    issues["cycles"] = cycles
+
+    save_state({"files": files, "issues": issues})
+    report = [i for k in sorted(issues) for i in issues[k]]
+    if logger:
+        logger.info(f"[Integrity] Checked {len(files)} file(s), re-read {len(changed)}, issues: {len(report)}")
+    return report
+
+# --- Repair ---
+
+def repair_orphans(logger=None) -> int:
+    """
+    Drop dangling names from manager/director reports, director departments
+    and team members. Duplicates and cycles need a human decision and are
+    left alone. Returns the number of files rewritten.
+    """
+    issues = check_integrity(logger=logger)
+    orphan_keys = {i.split("|")[1] for i in issues if i.startswith("orphan|")}
+    files = load_state()["files"]
+    idx = _build_indexes(files)
+    employees, managers, departments = idx["employees"], idx["managers"], idx["departments"]
+    fixed = 0
+    for key in sorted(orphan_keys):
+        kind, stem = key.split("/", 1)
+        name = stem.replace("_", " ")
+        if kind == "managers":
+            row = load_manager_txt(name)
+            if row is None:
+                continue
+            m_name, position, salary, reports = row
+            save_manager_txt(
+                m_name, position, salary,
+                [r for r in reports if r.casefold() in employees or r.casefold() in managers],
+            )
+        elif kind == "directors":
+            row = load_director_txt(name)
+            if row is None:
+                continue
+            d_name, position, salary, depts, reports = row
+            save_director_txt(
+                d_name, position, salary,
+                [d for d in depts if d.casefold() in departments],
+                [r for r in reports if r.casefold() in employees or r.casefold() in managers],
+            )
+        elif kind == "teams":
+            dept = _team_department(stem, idx["dept_keys"])
+            if dept is None:
+                continue
+            members = load_team_txt(stem)
+            save_team_txt(stem, [m for m in members if dept in employees.get(m.casefold(), [])])
+        else:
+            continue
+        fixed += 1
+        if logger:
+            logger.info(f"[Integrity] Repaired dangling references in {key}")
+    if fixed:
+        check_integrity(logger=logger)
+    return fixed
@@ -0,0 +1,364 @@
+import os
+from pathlib import Path
+
+from models.employee import Employee
+from services.storage import (DATA_ROOT, archive_file, dept_file, director_file, team_file_for,
+    safe_name, list_department_names,
+    load_department_txt, write_department, load_team_txt, write_team,
+    list_team_files_for_department, list_director_names, load_director_txt, write_director)
+
+# lives next to the files it protects, so it moves with the data tree
+JOURNAL_FILE = DATA_ROOT / "reorg_journal.txt"
+
+class ReorgError(ValueError):
+    """Raised before anything is written when a reorganization cannot be applied."""
+
+def _existing_department(name: str) -> str | None:
+    """Stored name of the department matching `name` case-insensitively, in either tier."""
+    key = name.strip().casefold()
+    for d in list_department_names():
+        if d.casefold() == key:
+            return d
+    return None
+
+def _require_department(name: str) -> str:
+    existing = _existing_department(name)
+    if existing is None:
+        raise ReorgError(f"Department {name} does not exist.")
+    return existing
+
+def _check_new_name(name: str) -> str:
+    """Reject names that would not produce a usable data/departments/<Name>.txt."""
+    name = name.strip()
+    if not name or not safe_name(name).strip("_") or "/" in name or "\\" in name:
+        raise ReorgError(f"'{name}' is not a usable department name.")
+    return name
+
+def _missing(names: list[str], employees: list[Employee]) -> list[str]:
+    present = {e.name.casefold() for e in employees}
+    return [n for n in names if n.casefold() not in present]
+
+class ReorgTransaction:
+    """
+    Collects changes to departments, their team files and director assignments
+    in memory. Every file is read at most once; commit() writes each changed
+    file once and applies all of them or none.
+    """
+    def __init__(self, logger=None):
+        self.logger = logger
+        self._departments: dict[str, tuple[str, list[Employee]]] = {}
+        self._teams: dict[str, dict[str, list[str]]] = {}
+        self._team_origin: dict[str, dict[Path, list[str]]] = {}
+        self._removed: set[str] = set()
+        self._directors: list[list] | None = None
+        self._touched: set[str] = set()
+
+    # --- Reads (cached, one per file) ---
+
+    def employees(self, name: str) -> list[Employee]:
+        key = name.casefold()
+        if key not in self._departments:
+            rows = load_department_txt(name) if key not in self._removed else []
+            self._departments[key] = (name, [Employee(n, p, s) for (n, p, s) in rows])
+        return self._departments[key][1]
+
+    def teams(self, name: str) -> dict[str, list[str]]:
+        key = name.casefold()
+        if key not in self._teams:
+            teams = {}
+            origin = {}
+            if key not in self._removed:
+                # legacy '<Dept>_<Team>' files are rewritten under team_file_for on commit
+                for t, path in list_team_files_for_department(name).items():
+                    teams[t] = load_team_txt(path.stem)
+                    origin[path] = list(teams[t])
+            self._teams[key] = teams
+            self._team_origin[key] = origin
+        return self._teams[key]
+
+    def directors(self) -> list[list]:
+        if self._directors is None:
+            self._directors = []
+            for n in list_director_names():
+                row = load_director_txt(n)
+                if row is not None:
+                    self._directors.append([*row, False])  # last item: dirty flag
+        return self._directors
+
+    # --- Changes ---
+
+    def touch(self, name: str) -> None:
+        self.employees(name)
+        self.teams(name)
+        self._touched.add(name.casefold())
+        self._removed.discard(name.casefold())
+
+    def remove_department(self, name: str) -> None:
+        self.employees(name)
+        self.teams(name)
+        key = name.casefold()
+        self._departments[key] = (name, [])
+        self._teams[key] = {}
+        self._removed.add(key)
+        self._touched.discard(key)
+
+    def replace_department_refs(self, old: str, new: str | None, also_add: str | None = None) -> None:
+        """Point director assignments of `old` at `new` (None drops them); `also_add` appends."""
+        key = old.casefold()
+        for row in self.directors():
+            depts = row[3]
+            if not any(d.casefold() == key for d in depts):
+                continue
+            updated = []
+            for d in depts:
+                d = new if d.casefold() == key else d
+                if d is not None and not any(u.casefold() == d.casefold() for u in updated):
+                    updated.append(d)
+            if also_add and not any(u.casefold() == also_add.casefold() for u in updated):
+                updated.append(also_add)
+            row[3] = updated
+            row[5] = True
+
+    # --- Commit ---
+
+    def _plan(self) -> tuple[dict[Path, tuple], set[Path]]:
+        writes: dict[Path, tuple] = {}
+        deletes: set[Path] = set()
+        for key, (name, employees) in self._departments.items():
+            path = dept_file(name)
+            if key in self._removed:
+                deletes.update(p for p in (path, archive_file(path)) if p.exists())
+            elif key in self._touched:
+                writes[path] = (write_department, employees)
+                if archive_file(path).exists():
+                    deletes.add(archive_file(path))
+        for key, teams in self._teams.items():
+            if key not in self._touched and key not in self._removed:
+                continue
+            name = self._departments[key][0]
+            origin = self._team_origin[key]
+            current = set()
+            for t, members in teams.items():
+                path = team_file_for(name, t)
+                current.add(path)
+                if origin.get(path) != members:
+                    writes[path] = (write_team, members)
+            deletes.update(set(origin) - current)
+        for (d_name, position, salary, depts, reports, dirty) in self._directors or []:
+            if dirty:
+                path = director_file(d_name)
+                writes[path] = (write_director, d_name, position, salary, depts, reports)
+                if archive_file(path).exists():
+                    deletes.add(archive_file(path))
+        deletes -= set(writes)
+        return writes, deletes
+
+    def commit(self) -> int:
+        """
+        Stage every write in a temp file, move the originals aside, then swap
+        the new files in. JOURNAL_FILE lists every affected path for the whole
+        swap, so a crash at any point is rolled back (or, once the journal says
+        'committed', finished) by recover_reorg(). Returns files changed.
+        """
+        writes, deletes = self._plan()
+        entries = [(path, path in writes, path.exists()) for path in sorted(set(writes) | deletes)]
+        _write_journal("pending", entries)
+        try:
+            for path, (writer, *args) in writes.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with _staged(path).open("w", encoding="utf-8") as f:
+                    writer(f, *args)
+            for path, _, existed in entries:
+                if existed:
+                    path.replace(_backup(path))
+            for path in writes:
+                _staged(path).replace(path)
+        except Exception:
+            _rollback(entries)
+            JOURNAL_FILE.unlink(missing_ok=True)
+            raise
+        _write_journal("committed", entries)
+        _finish(entries)
+        JOURNAL_FILE.unlink(missing_ok=True)
+        if self.logger:
+            self.logger.info(f"[Reorg] Committed {len(writes)} write(s), {len(deletes)} removal(s)")
+        return len(writes) + len(deletes)
+
+# --- Journal / recovery ---
+
+def _staged(path: Path) -> Path:
+    return path.with_name(path.name + ".reorg")
+
+def _backup(path: Path) -> Path:
+    return path.with_name(path.name + ".reorg-bak")
+
+def _write_journal(status: str, entries: list[tuple[Path, bool, bool]]) -> None:
+    """
+    First line is the status ('pending' or 'committed'), then one
+    'path|written|existed' line per affected file.
+    """
+    JOURNAL_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = JOURNAL_FILE.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(f"{status}\n")
+        for path, written, existed in entries:
+            f.write(f"{path.as_posix()}|{int(written)}|{int(existed)}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(JOURNAL_FILE)
+
+def _read_journal() -> tuple[str, list[tuple[Path, bool, bool]]]:
+    with JOURNAL_FILE.open("r", encoding="utf-8") as f:
+        status = f.readline().strip()
+        entries = []
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            path, written, existed = line.rsplit("|", 2)
+            entries.append((Path(path), written == "1", existed == "1"))
+    return status, entries
+
+def _rollback(entries: list[tuple[Path, bool, bool]]) -> None:
+    for path, written, existed in entries:
+        if _backup(path).exists():
+            _backup(path).replace(path)
+        elif written and not existed:
+            path.unlink(missing_ok=True)
+        _staged(path).unlink(missing_ok=True)
+
+def _finish(entries: list[tuple[Path, bool, bool]]) -> None:
+    for path, _, _ in entries:
+        _backup(path).unlink(missing_ok=True)
+        _staged(path).unlink(missing_ok=True)
+
+def recover_reorg(logger=None) -> str | None:
+    """
+    Run at startup: complete or undo a reorganization interrupted by a crash.
+    Returns 'rolled back', 'completed' or None when there was nothing to do.
+    """
+    if not JOURNAL_FILE.exists():
+        return None
+    status, entries = _read_journal()
+    if status == "committed":
+        _finish(entries)
+        outcome = "completed"
+    else:
+        _rollback(entries)
+        outcome = "rolled back"
+    JOURNAL_FILE.unlink()
+    if logger:
+        logger.info(f"[Reorg] Interrupted reorganization {outcome} ({len(entries)} file(s))")
+    return outcome
+
+# --- Operations ---
+
+def _move_employees(tx: ReorgTransaction, source: str, target: str, picked: list[Employee]) -> None:
+    src, dst = tx.employees(source), tx.employees(target)
+    taken = {e.name.casefold() for e in dst}
+    clashes = [e.name for e in picked if e.name.casefold() in taken]
+    if clashes:
+        raise ReorgError(f"Already in department {target}: {', '.join(clashes)}")
+    moving = {e.name.casefold() for e in picked}
+    src[:] = [e for e in src if e.name.casefold() not in moving]
+    dst.extend(picked)
+    # people who left the department also leave its teams
+    for members in tx.teams(source).values():
+        members[:] = [m for m in members if m.casefold() not in moving]
+    tx.touch(source)
+    tx.touch(target)
+
+def transfer_employees(names: list[str], source: str, target: str, logger=None) -> int:
+    """Move the named employees from `source` to `target` (created if missing)."""
+    if not names:
+        raise ReorgError("No employees given to transfer.")
+    source = _require_department(source)
+    target = _existing_department(target) or _check_new_name(target)
+    if source.casefold() == target.casefold():
+        raise ReorgError("Source and target department are the same.")
+    tx = ReorgTransaction(logger)
+    missing = _missing(names, tx.employees(source))
+    if missing:
+        raise ReorgError(f"Not in department {source}: {', '.join(missing)}")
+    wanted = {n.casefold() for n in names}
+    picked = [e for e in tx.employees(source) if e.name.casefold() in wanted]
+    _move_employees(tx, source, target, picked)
+    changed = tx.commit()
+    if logger:
+        logger.info(f"[Reorg] Transferred {len(picked)} employee(s) from {source} to {target}")
+    return changed
+
+def merge_departments(source: str, target: str, logger=None) -> int:
+    """Move everyone and every team of `source` into `target` and remove `source`."""
+    source = _require_department(source)
+    target = _require_department(target)
+    if source.casefold() == target.casefold():
+        raise ReorgError("Source and target department are the same.")
+    tx = ReorgTransaction(logger)
+    source_teams = {t: list(m) for t, m in tx.teams(source).items()}
+    _move_employees(tx, source, target, list(tx.employees(source)))
+    target_teams = tx.teams(target)
+    for t, members in source_teams.items():
+        existing = target_teams.setdefault(t, [])
+        seen = {e.casefold() for e in existing}
+        for m in members:
+            if m.casefold() not in seen:
+                seen.add(m.casefold())
+                existing.append(m)
+    tx.remove_department(source)
+    tx.replace_department_refs(source, target)
+    changed = tx.commit()
+    if logger:
+        logger.info(f"[Reorg] Merged department {source} into {target}")
+    return changed
+
+def split_department(source: str, new_name: str, positions: list[str] | None = None,
+                     names: list[str] | None = None, logger=None) -> int:
+    """
+    Move employees of `source` whose position is in `positions` or whose name is
+    in `names` into the new department `new_name`. Directors of `source` are
+    assigned the new department as well.
+    """
+    source = _require_department(source)
+    new_name = _check_new_name(new_name)
+    if _existing_department(new_name):
+        raise ReorgError(f"Department {new_name} already exists.")
+    if not positions and not names:
+        raise ReorgError("Give positions or names to split by.")
+    tx = ReorgTransaction(logger)
+    missing = _missing(names or [], tx.employees(source))
+    if missing:
+        raise ReorgError(f"Not in department {source}: {', '.join(missing)}")
+    by_position = {p.casefold() for p in positions or []}
+    by_name = {n.casefold() for n in names or []}
+    picked = [e for e in tx.employees(source)
+              if e.position.casefold() in by_position or e.name.casefold() in by_name]
+    if not picked:
+        raise ReorgError(f"No employees of {source} match the split.")
+    _move_employees(tx, source, new_name, picked)
+    tx.replace_department_refs(source, source, also_add=new_name)
+    changed = tx.commit()
+    if logger:
+        logger.info(f"[Reorg] Split {len(picked)} employee(s) from {source} into {new_name}")
+    return changed
+
+def rename_department(old: str, new: str, logger=None) -> int:
+    """Rename a department together with its team files and director assignments."""
+    old = _require_department(old)
+    new = _check_new_name(new)
+    if old.casefold() == new.casefold():
+        raise ReorgError(f"Department {old} is already named {new}.")
+    if _existing_department(new):
+        raise ReorgError(f"Department {new} already exists.")
+    tx = ReorgTransaction(logger)
+    employees = list(tx.employees(old))
+    teams = {t: list(m) for t, m in tx.teams(old).items()}
+    tx.remove_department(old)
+    tx.touch(new)
+    tx.employees(new)[:] = employees
+    tx.teams(new).update(teams)
+    tx.replace_department_refs(old, new)
+    changed = tx.commit()
+    if logger:
+        logger.info(f"[Reorg] Renamed department {old} to {new}")
+    return changed
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+
+from services.storage import (DATA_ROOT, HASH_CHUNK, file_hash, archive_file,
+    dept_file, manager_file, director_file, team_file_for)
+
+SNAPSHOT_ROOT = Path("snapshots")
+OBJECTS_DIR = SNAPSHOT_ROOT / "objects"
+MANIFESTS_DIR = SNAPSHOT_ROOT / "manifests"
+
+class SnapshotError(ValueError):
+    """Raised when a restore target cannot be resolved; nothing is changed."""
+
+# --- Manifests ---
+
+def list_snapshots() -> list[str]:
+    if not MANIFESTS_DIR.exists():
+        return []
+    return sorted(p.stem for p in MANIFESTS_DIR.glob("*.txt"))
+
+def load_manifest(snapshot_id: str) -> dict[str, tuple[int, int, str]]:
+    """
+    Returns {relative path: (mtime_ns, size, sha256)}.
+    """
+    entries = {}
+    with (MANIFESTS_DIR / f"{snapshot_id}.txt").open("r", encoding="utf-8") as f:
+        header = f.readline()  # discard header
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            rel, mtime_ns, size, digest = line.rsplit("|", 3)
+            entries[rel] = (int(mtime_ns), int(size), digest)
+    return entries
+
+def _save_manifest(snapshot_id: str, entries: dict[str, tuple[int, int, str]]) -> None:
+    MANIFESTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = MANIFESTS_DIR / f"{snapshot_id}.txt"
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write("path|mtime_ns|size|sha256\n")
+        for rel in sorted(entries):
+            mtime_ns, size, digest = entries[rel]
+            f.write(f"{rel}|{mtime_ns}|{size}|{digest}\n")
+    tmp.replace(path)
+
+def object_file(digest: str) -> Path:
+    return OBJECTS_DIR / digest[:2] / digest
+
+def _data_files() -> list[Path]:
+    if not DATA_ROOT.exists():
+        return []
+    return [p for p in DATA_ROOT.rglob("*") if p.is_file()]
+
+def _store_object(path: Path) -> tuple[str, int, bool]:
+    """
+    Copy a file into the object store while hashing it, so the stored bytes
+    are exactly the bytes hashed. Returns (sha256, size, newly written).
+    """
+    OBJECTS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = OBJECTS_DIR / f"incoming-{os.getpid()}.tmp"
+    h = hashlib.sha256()
+    size = 0
+    with path.open("rb") as src, tmp.open("wb") as dst:
+        for chunk in iter(lambda: src.read(HASH_CHUNK), b""):
+            h.update(chunk)
+            dst.write(chunk)
+            size += len(chunk)
+    digest = h.hexdigest()
+    obj = object_file(digest)
+    if obj.exists():
+        tmp.unlink()
+        return digest, size, False
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    tmp.replace(obj)
+    return digest, size, True
+
+# --- Snapshot / restore ---
+
+def create_snapshot(logger=None) -> tuple[str, int, int]:
+    """
+    Snapshot data/ into the object store. Files whose mtime and size match
+    the previous manifest reuse its hash without being read; identical
+    content is stored once. Returns (snapshot id, files, objects written).
+    """
+    snapshots = list_snapshots()
+    previous = load_manifest(snapshots[-1]) if snapshots else {}
+    snapshot_id = time.strftime("%Y%m%d-%H%M%S")
+    if snapshot_id in snapshots:
+        snapshot_id += f"-{len(snapshots):04d}"
+
+    entries = {}
+    written = 0
+    for path in _data_files():
+        rel = path.relative_to(DATA_ROOT).as_posix()
+        st = path.stat()
+        prev = previous.get(rel)
+        if prev and prev[0] == st.st_mtime_ns and prev[1] == st.st_size:
+            entries[rel] = prev
+            continue
+        digest, size, new = _store_object(path)
+        written += new
+        entries[rel] = (st.st_mtime_ns, size, digest)
+
+    _save_manifest(snapshot_id, entries)
+    if logger:
+        logger.info(f"[Snapshot {snapshot_id}] {len(entries)} file(s), {written} new object(s)")
+    return snapshot_id, len(entries), written
+
+ENTITY_FILES = {
+    "departments": dept_file,
+    "managers": manager_file,
+    "directors": director_file,
+}
+
+def _entity_paths(entity: str) -> set[str]:
+    """
+    Resolve 'departments/<Name>', 'managers/<Name>', 'directors/<Name>' or
+    'teams/<Dept>/<Team>' to the entity's relative paths in both tiers,
+    using the same storage helpers that write them.
+    """
+    kind, _, name = entity.partition("/")
+    name = name.strip()
+    if kind == "teams":
+        dept, _, team = name.partition("/")
+        if not dept.strip() or not team.strip():
+            raise SnapshotError("Teams are restored as 'teams/<Department>/<Team>'.")
+        paths = [team_file_for(dept.strip(), team.strip())]
+    elif kind in ENTITY_FILES:
+        if not name:
+            raise SnapshotError(f"Missing name after '{kind}/'.")
+        path = ENTITY_FILES[kind](name)
+        paths = [path, archive_file(path)]
+    else:
+        raise SnapshotError("Entity must start with departments/, managers/, directors/ or teams/.")
+    return {p.relative_to(DATA_ROOT).as_posix() for p in paths}
+
+def restore_snapshot(snapshot_id: str, entity: str | None = None, logger=None) -> int:
+    """
+    Restore the whole data tree, or a single entity such as 'managers/Martin Jurga',
+    to the state recorded in a snapshot. Files absent from the snapshot are
+    removed; files already matching it are left alone. Returns files changed.
+    Raises SnapshotError for an entity that is neither in the snapshot nor on disk.
+    """
+    manifest = load_manifest(snapshot_id)
+    if entity is None:
+        scope = set(manifest) | {p.relative_to(DATA_ROOT).as_posix() for p in _data_files()}
+    else:
+        scope = _entity_paths(entity)
+        if not any(rel in manifest or (DATA_ROOT / rel).exists() for rel in scope):
+            raise SnapshotError(f"{entity} is not in snapshot {snapshot_id} or on disk.")
+
+    changed = 0
+    for rel in sorted(scope):
+        path = DATA_ROOT / rel
+        if rel not in manifest:
+            if path.exists():
+                path.unlink()
+                changed += 1
+            continue
+        mtime_ns, size, digest = manifest[rel]
+        if path.exists():
+            st = path.stat()
+            if st.st_size == size and (st.st_mtime_ns == mtime_ns or file_hash(path) == digest):
+                continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".restore")
+        shutil.copyfile(object_file(digest), tmp)
+        tmp.replace(path)
+        # keep the recorded mtime so the next snapshot sees the file as unchanged
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        changed += 1
+
+    if logger:
+        target = entity or "data tree"
+        logger.info(f"[Snapshot {snapshot_id}] Restored {target}: {changed} file(s) changed")
+    return changed
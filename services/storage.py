@@ -1,7 +1,11 @@
 from pathlib import Path
+import gzip
+import hashlib
 import re
 
 DATA_ROOT = Path("data")
+ARCHIVE_ROOT = DATA_ROOT / "archive"
+HASH_CHUNK = 1 << 16
 
 def ensure_dirs():
     (DATA_ROOT / "departments").mkdir(parents=True, exist_ok=True)
@@ -16,6 +20,53 @@ def safe_name(s: str) -> str:
     """
     s = s.strip()
     return re.sub(r"[^A-Za-z0-9_-]+", "_", s)
+
+def file_hash(path: Path) -> str:
+    """sha256 of a file, read in HASH_CHUNK pieces."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# --- Cold tier (gzip archives under data/archive) ---
+
+def archive_file(path: Path) -> Path:
+    """
+    data/<kind>/<Name>.txt -> data/archive/<kind>/<Name>.txt.gz
+    """
+    return ARCHIVE_ROOT / path.relative_to(DATA_ROOT).with_suffix(".txt.gz")
+
+def open_text(path: Path):
+    """
+    Open a hot file for reading, or stream-decompress its archived copy.
+    Returns None when the entity exists in neither tier.
+    """
+    if path.exists():
+        return path.open("r", encoding="utf-8")
+    cold = archive_file(path)
+    if cold.exists():
+        return gzip.open(cold, "rt", encoding="utf-8")
+    return None
+
+def promote(path: Path) -> None:
+    """Called after a write: the hot file is now current, drop the archived copy."""
+    archive_file(path).unlink(missing_ok=True)
+
+def archived_names(kind: str) -> list[str]:
+    """Names of archived entities of a kind ('departments', 'managers', 'directors')."""
+    cold_dir = ARCHIVE_ROOT / kind
+    if not cold_dir.exists():
+        return []
+    # "<Name>.txt.gz" -> "<Name>"
+    return [p.name[:-len(".txt.gz")].replace("_", " ") for p in cold_dir.glob("*.txt.gz")]
+
+def _list_names(kind: str) -> list[str]:
+    hot_dir = DATA_ROOT / kind
+    names = {p.stem.replace("_", " ") for p in hot_dir.glob("*.txt")} if hot_dir.exists() else set()
+    names.update(archived_names(kind))
+    return sorted(names, key=str.casefold)
+
 # --- TXT storage for departments (employees) ---
 
 def dept_file(department_name: str) -> Path:
@@ -29,19 +80,23 @@ def save_department_txt(department_name: str, employees: list) -> None:
     path = dept_file(department_name)
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        f.write("name|position|salary\n")
-        for e in employees:
-            f.write(f"{e.name}|{e.position}|{e.salary}\n")
+        write_department(f, employees)
+    promote(path)
+
+def write_department(f, employees: list) -> None:
+    f.write("name|position|salary\n")
+    for e in employees:
+        f.write(f"{e.name}|{e.position}|{e.salary}\n")
 
 def load_department_txt(department_name: str) -> list[tuple[str, str, float]]:
     """
     Returns list of tuples: (name, position, salary)
     """
-    path = dept_file(department_name)
-    if not path.exists():
+    f = open_text(dept_file(department_name))
+    if f is None:
         return []
     rows = []
-    with path.open("r", encoding="utf-8") as f:
+    with f:
         header = f.readline()  # discard header
         for line in f:
             line = line.strip()
@@ -76,8 +131,11 @@ def save_team_txt_for(department_name: str, team_name: str, members: list[str])
     path = team_file_for(department_name, team_name)
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        for m in members:
-            f.write(f"{m}\n")
+        write_team(f, members)
+
+def write_team(f, members: list[str]) -> None:
+    for m in members:
+        f.write(f"{m}\n")
 
 def load_team_txt_for(department_name: str, team_name: str) -> list[str]:
     path = team_file_for(department_name, team_name)
@@ -98,6 +156,48 @@ def list_team_names_for_department(department_name: str) -> list[str]:
         names.append(t)
     return sorted(names, key=str.casefold)
 
+def delete_team_txt(team_name: str) -> None:
+    team_file(team_name).unlink(missing_ok=True)
+
+def list_team_files_for_department(department_name: str) -> dict[str, Path]:
+    """
+    Team name -> file, for '<Dept>__<Team>.txt' files and the two legacy layouts:
+    '<Dept>_<Team>.txt' (older Team.save) and '<Team>_<Dept>.txt' (older menu,
+    which passed the names to Team.load swapped). A legacy file that a longer
+    department name also matches, or that another department prefixes,
+    belongs to that department instead.
+    """
+    teams = {t: team_file_for(department_name, t) for t in list_team_names_for_department(department_name)}
+    teams_dir = DATA_ROOT / "teams"
+    if not teams_dir.exists():
+        return teams
+    dept = department_name.replace(" ", "_")
+    others = [d.replace(" ", "_") for d in list_department_names() if d.casefold() != department_name.casefold()]
+    longer_prefixes = [f"{o}_" for o in others if o.startswith(f"{dept}_")]
+    longer_suffixes = [f"_{o}" for o in others if o.endswith(f"_{dept}")]
+    other_prefixes = [f"{o}_" for o in others]
+    for p in teams_dir.glob("*.txt"):
+        stem = p.stem
+        if "__" in stem:
+            continue  # '<Dept>__<Team>' files are listed above
+        if stem.startswith(f"{dept}_") and not any(stem.startswith(o) for o in longer_prefixes):
+            team = stem[len(dept) + 1:]
+        elif (stem.endswith(f"_{dept}") and not any(stem.endswith(o) for o in longer_suffixes)
+              and not any(stem.startswith(o) for o in other_prefixes)):
+            team = stem[:-len(dept) - 1]
+        else:
+            continue
+        if team:
+            teams.setdefault(team.replace("_", " "), p)
+    return teams
+
+def find_team_file(department_name: str, team_name: str) -> Path | None:
+    key = team_name.replace("_", " ").casefold()
+    for t, path in list_team_files_for_department(department_name).items():
+        if t.casefold() == key:
+            return path
+    return None
+
 def manager_file(manager_name: str) -> Path:
     safe = manager_name.replace(" ", "_")
     return DATA_ROOT / "managers" / f"{safe}.txt"
@@ -111,12 +211,13 @@ def save_manager_txt(manager_name: str, position: str, salary: float, direct_rep
         f.write("--direct_reports--\n")
         for r in direct_reports:
             f.write(f"{r}\n")
+    promote(path)
 
 def load_manager_txt(manager_name: str) -> tuple[str, str, float, list[str]] | None:
-    path = manager_file(manager_name)
-    if not path.exists():
+    f = open_text(manager_file(manager_name))
+    if f is None:
         return None
-    with path.open("r", encoding="utf-8") as f:
+    with f:
         lines = [ln.strip() for ln in f if ln.strip()]
     if not lines or not lines[0].lower().startswith("name|position|salary"):
         return None
@@ -131,10 +232,7 @@ def load_manager_txt(manager_name: str) -> tuple[str, str, float, list[str]] | N
     return name, position, float(salary), reports
 
 def list_manager_names() -> list[str]:
-    mgr_dir = DATA_ROOT / "managers"
-    if not mgr_dir.exists():
-        return []
-    return sorted([p.stem.replace("_", " ") for p in mgr_dir.glob("*.txt")], key=str.casefold)
+    return _list_names("managers")
 
 def director_file(director_name: str) -> Path:
     safe = director_name.replace(" ", "_")
@@ -145,20 +243,25 @@ def save_director_txt(director_name: str, position: str, salary: float,
     path = director_file(director_name)
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        f.write("name|position|salary\n")
-        f.write(f"{director_name}|{position}|{salary:.2f}\n")
-        f.write("--departments--\n")
-        for d in departments:
-            f.write(f"{d}\n")
-        f.write("--direct_reports--\n")
-        for r in direct_reports:
-            f.write(f"{r}\n")
+        write_director(f, director_name, position, salary, departments, direct_reports)
+    promote(path)
+
+def write_director(f, director_name: str, position: str, salary: float,
+                   departments: list[str], direct_reports: list[str]) -> None:
+    f.write("name|position|salary\n")
+    f.write(f"{director_name}|{position}|{salary:.2f}\n")
+    f.write("--departments--\n")
+    for d in departments:
+        f.write(f"{d}\n")
+    f.write("--direct_reports--\n")
+    for r in direct_reports:
+        f.write(f"{r}\n")
 
 def load_director_txt(director_name: str) -> tuple[str, str, float, list[str], list[str]] | None:
-    path = director_file(director_name)
-    if not path.exists():
+    f = open_text(director_file(director_name))
+    if f is None:
         return None
-    with path.open("r", encoding="utf-8") as f:
+    with f:
         lines = [ln.strip() for ln in f if ln.strip()]
     if not lines or not lines[0].lower().startswith("name|position|salary"):
         return None
@@ -192,8 +295,7 @@ def load_director_txt(director_name: str) -> tuple[str, str, float, list[str], l
     return d_name, position, salary, depts, reports
 
 def list_director_names() -> list[str]:
-    ddir = DATA_ROOT / "directors"
-    if not ddir.exists():
-        return []
-    return sorted([p.stem.replace("_", " ") for p in ddir.glob("*.txt")], key=str.casefold)
+    return _list_names("directors")
 
+def list_department_names() -> list[str]:
+    return _list_names("departments")